@@ -1,94 +1,124 @@
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 
 # Put database in src directory for easier access and permission
 DB_PATH = os.path.join(os.path.dirname(__file__), "mindharbor.db")
 
 
-def get_conn():
+def _connect():
     # Ensure directory exists
     db_dir = os.path.dirname(DB_PATH)
     if db_dir and not os.path.exists(db_dir):
         os.makedirs(db_dir, exist_ok=True)
-    
-    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
+
+    # One shared autocommit connection; writes are serialized with _write_lock
+    conn = sqlite3.connect(
+        DB_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+        isolation_level=None,
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA mmap_size=268435456")
     return conn
 
 
-def init_db():
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            user_id TEXT PRIMARY KEY,
-            tokens_remaining INTEGER DEFAULT 0,
-            pass_expiry TEXT DEFAULT NULL
-        )
-        """
+_CONN = _connect()
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def _transaction():
+    # Group several writes into a single commit
+    with _write_lock:
+        _CONN.execute("BEGIN IMMEDIATE")
+        try:
+            yield _CONN
+        except Exception:
+            _CONN.execute("ROLLBACK")
+            raise
+        _CONN.execute("COMMIT")
+
+
+_USERS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id TEXT PRIMARY KEY,
+        tokens_remaining INTEGER DEFAULT 0,
+        pass_expiry INTEGER DEFAULT NULL
     )
-    conn.commit()
-    conn.close()
+"""
+
+
+def init_db():
+    with _transaction() as conn:
+        conn.execute(_USERS_SCHEMA)
+        columns = {row["name"]: row["type"] for row in conn.execute("PRAGMA table_info(users)")}
+        if columns.get("pass_expiry", "").upper() == "TEXT":
+            # Older databases stored pass_expiry as ISO-8601 text; convert to Unix epoch seconds
+            conn.execute("ALTER TABLE users RENAME TO users_old")
+            conn.execute(_USERS_SCHEMA)
+            conn.execute(
+                """
+                INSERT INTO users(user_id, tokens_remaining, pass_expiry)
+                SELECT user_id, tokens_remaining, CAST(strftime('%s', pass_expiry) AS INTEGER)
+                FROM users_old
+                """
+            )
+            conn.execute("DROP TABLE users_old")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_users_pass_expiry ON users(pass_expiry)")
+
+
+# Create or migrate the schema as soon as the module connects; has_valid_pass
+# relies on pass_expiry holding integers
+init_db()
 
 
 def get_or_create_user(user_id: str):
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-    row = c.fetchone()
+    row = _CONN.execute("SELECT * FROM users WHERE user_id = ?", (user_id,)).fetchone()
     if row:
-        res = dict(row)
-        conn.close()
-        return res
-    c.execute("INSERT INTO users(user_id, tokens_remaining) VALUES (?, ?)", (user_id, 0))
-    conn.commit()
-    conn.close()
+        return dict(row)
+    with _write_lock:
+        _CONN.execute("INSERT OR IGNORE INTO users(user_id, tokens_remaining) VALUES (?, ?)", (user_id, 0))
     return {"user_id": user_id, "tokens_remaining": 0, "pass_expiry": None}
 
 
 def decrement_token(user_id: str) -> bool:
-    u = get_or_create_user(user_id)
-    if u.get("tokens_remaining", 0) > 0:
-        conn = get_conn()
-        c = conn.cursor()
-        c.execute("UPDATE users SET tokens_remaining = tokens_remaining - 1 WHERE user_id = ?", (user_id,))
-        conn.commit()
-        conn.close()
-        return True
-    return False
+    with _transaction() as conn:
+        conn.execute("INSERT OR IGNORE INTO users(user_id, tokens_remaining) VALUES (?, 0)", (user_id,))
+        cur = conn.execute(
+            "UPDATE users SET tokens_remaining = tokens_remaining - 1 WHERE user_id = ? AND tokens_remaining > 0",
+            (user_id,),
+        )
+    return cur.rowcount == 1
 
 
 def add_tokens(user_id: str, amount: int):
     get_or_create_user(user_id)
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("UPDATE users SET tokens_remaining = tokens_remaining + ? WHERE user_id = ?", (amount, user_id))
-    conn.commit()
-    conn.close()
+    with _write_lock:
+        _CONN.execute("UPDATE users SET tokens_remaining = tokens_remaining + ? WHERE user_id = ?", (amount, user_id))
 
 
 def set_pass_expiry(user_id: str, days: int):
-    expiry = (datetime.now(timezone.utc) + timedelta(days=days)).isoformat()
+    expiry = int((datetime.now(timezone.utc) + timedelta(days=days)).timestamp())
     get_or_create_user(user_id)
-    conn = get_conn()
-    c = conn.cursor()
-    c.execute("UPDATE users SET pass_expiry = ? WHERE user_id = ?", (expiry, user_id))
-    conn.commit()
-    conn.close()
+    with _write_lock:
+        _CONN.execute("UPDATE users SET pass_expiry = ? WHERE user_id = ?", (expiry, user_id))
 
 
 def has_valid_pass(user_id: str) -> bool:
-    u = get_or_create_user(user_id)
-    expiry = u.get("pass_expiry")
-    if not expiry:
-        return False
-    try:
-        exp_dt = datetime.fromisoformat(expiry)
-        return exp_dt > datetime.now(timezone.utc)
-    except Exception:
-        return False
+    row = _CONN.execute(
+        "SELECT 1 FROM users WHERE user_id = ? AND typeof(pass_expiry) = 'integer'"
+        " AND pass_expiry > CAST(strftime('%s', 'now') AS INTEGER)",
+        (user_id,),
+    ).fetchone()
+    return row is not None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,14 @@
+# Gunicorn settings for serving MindHarbor with uvicorn workers
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Import the app in the master so the embedding model is loaded once and
+# shared copy-on-write by all forked workers
+preload_app = True
+
+
+def on_starting(server):
+    # Only the model is loaded here; each worker opens its own SQLite
+    # connections when it first builds the vector store
+    from vector_store import EMBEDDING_BACKEND, load_model
+
+    load_model(backend=EMBEDDING_BACKEND)
@@ -1,14 +1,53 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-import datetime
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import BaseModel
+from datetime import datetime, timezone
 
-app = FastAPI()
+from utils import contains_crisis
+from vector_store import get_vector_store
 
-@app.get("/health")
+_UTC = timezone.utc
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the embedding model at startup instead of on the first /query.
+    # Under gunicorn with preload_app this already happened in the master
+    # before fork, so workers share its weights copy-on-write.
+    get_vector_store().model
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+class QueryRequest(BaseModel):
+    user_id: str
+    message: str
+    k: int = 3
+
+
+@app.get("/health", response_class=ORJSONResponse)
 async def health():
     """Simple health check returning status and current UTC time."""
-    return JSONResponse({"status": "ok", "time": datetime.datetime.now(datetime.timezone.utc).isoformat()})
+    return {"status": "ok", "time": datetime.now(_UTC).isoformat()}
 
 @app.get("/")
 async def root():
     return JSONResponse({"message": "MindHarbor API running"})
+
+@app.post("/query")
+async def query(req: QueryRequest):
+    """Retrieve the documents most relevant to the user's message."""
+    # Crisis messages get the crisis response, no retrieval needed
+    if contains_crisis(req.message):
+        return JSONResponse({"user_id": req.user_id, "crisis": True, "results": []})
+    
+    # Concurrent queries share a single batched embedding call
+    results = await get_vector_store().similarity_search_async(req.message, k=req.k)
+    return JSONResponse({
+        "user_id": req.user_id,
+        "crisis": False,
+        "results": [{"text": text, "score": score} for text, score in results],
+    })
@@ -0,0 +1,96 @@
+"""Tests for the users database helpers."""
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import db
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    """Point db at an empty database file for the duration of a test."""
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "mindharbor.db"))
+    conn = db._connect()
+    monkeypatch.setattr(db, "_CONN", conn)
+    db.init_db()
+    yield db
+    conn.close()
+
+
+def test_decrement_token_without_tokens(fresh_db):
+    assert fresh_db.decrement_token("new_user") is False
+    assert fresh_db.get_or_create_user("new_user")["tokens_remaining"] == 0
+
+
+def test_decrement_token_spends_exactly_available_tokens(fresh_db):
+    fresh_db.add_tokens("u1", 3)
+
+    results = [fresh_db.decrement_token("u1") for _ in range(5)]
+
+    assert results == [True, True, True, False, False]
+    assert fresh_db.get_or_create_user("u1")["tokens_remaining"] == 0
+
+
+def test_concurrent_decrements_never_overspend(fresh_db):
+    fresh_db.add_tokens("u1", 20)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: fresh_db.decrement_token("u1"), range(50)))
+
+    assert results.count(True) == 20
+    assert fresh_db.get_or_create_user("u1")["tokens_remaining"] == 0
+
+
+def test_init_db_migrates_iso_expiry_to_epoch(tmp_path, monkeypatch):
+    path = str(tmp_path / "legacy.db")
+    legacy = sqlite3.connect(path)
+    legacy.execute(
+        "CREATE TABLE users (user_id TEXT PRIMARY KEY, tokens_remaining INTEGER DEFAULT 0,"
+        " pass_expiry TEXT DEFAULT NULL)"
+    )
+    now = datetime.now(timezone.utc)
+    legacy.executemany(
+        "INSERT INTO users VALUES (?, ?, ?)",
+        [
+            ("valid", 2, (now + timedelta(days=3)).isoformat()),
+            ("expired", 1, datetime(2000, 1, 1, tzinfo=timezone.utc).isoformat()),
+            ("no_pass", 0, None),
+        ],
+    )
+    legacy.commit()
+    legacy.close()
+
+    monkeypatch.setattr(db, "DB_PATH", path)
+    conn = db._connect()
+    monkeypatch.setattr(db, "_CONN", conn)
+    db.init_db()
+
+    valid = db.get_or_create_user("valid")
+    assert valid["tokens_remaining"] == 2
+    assert valid["pass_expiry"] == int((now + timedelta(days=3)).timestamp())
+    assert db.has_valid_pass("valid") is True
+    assert db.has_valid_pass("expired") is False
+    assert db.has_valid_pass("no_pass") is False
+    assert db.has_valid_pass("missing") is False
+    conn.close()
+
+
+def test_has_valid_pass_follows_set_pass_expiry(fresh_db):
+    fresh_db.set_pass_expiry("u1", 1)
+    assert fresh_db.has_valid_pass("u1") is True
+
+    fresh_db.set_pass_expiry("u1", -1)
+    assert fresh_db.has_valid_pass("u1") is False
+
+
+def test_has_valid_pass_ignores_unmigrated_text_expiry(fresh_db):
+    fresh_db._CONN.execute(
+        "INSERT INTO users(user_id, pass_expiry) VALUES (?, ?)", ("legacy", "2000-01-01T00:00:00+00:00")
+    )
+    assert fresh_db.has_valid_pass("legacy") is False
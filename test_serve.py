@@ -0,0 +1,48 @@
+"""Tests for the FastAPI app."""
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import serve
+
+
+class FakeStore:
+    def __init__(self):
+        self.queries = []
+
+    async def similarity_search_async(self, query, k=3):
+        self.queries.append((query, k))
+        return [("Grounding exercises can help with anxiety.", 0.9)]
+
+
+def test_query_returns_retrieved_documents(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(serve, "get_vector_store", lambda: store)
+
+    response = TestClient(serve.app).post("/query", json={"user_id": "u1", "message": "help", "k": 1})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "user_id": "u1",
+        "crisis": False,
+        "results": [{"text": "Grounding exercises can help with anxiety.", "score": 0.9}],
+    }
+    assert store.queries == [("help", 1)]
+
+
+def test_query_skips_retrieval_for_crisis_messages(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(serve, "get_vector_store", lambda: store)
+
+    response = TestClient(serve.app).post(
+        "/query", json={"user_id": "u1", "message": "I want to kill myself"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "u1", "crisis": True, "results": []}
+    assert store.queries == []
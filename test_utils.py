@@ -0,0 +1,46 @@
+"""Tests for crisis phrase detection."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils
+from utils import contains_crisis
+
+
+CRISIS_MESSAGES = [
+    "I want to kill myself",
+    "Sometimes I think about SUICIDE",
+    "i don't want to live anymore",
+    "I don’t want to live anymore",
+    "I keep   thinking about\nending my life",
+    "I've been hurting myself again",
+]
+
+NORMAL_MESSAGES = [
+    "I feel sad",
+    "",
+    "My exams are killing me but I'll survive",
+    "I want to live a calmer life",
+    "Can you help me sleep better?",
+]
+
+
+@pytest.mark.parametrize("message", CRISIS_MESSAGES)
+def test_detects_crisis_messages(message):
+    assert contains_crisis(message) is True
+
+
+@pytest.mark.parametrize("message", NORMAL_MESSAGES)
+def test_ignores_normal_messages(message):
+    assert contains_crisis(message) is False
+
+
+def test_regex_fallback_matches_the_same_messages(monkeypatch):
+    monkeypatch.setattr(utils, "ahocorasick", None)
+    monkeypatch.setattr(utils, "_matches_crisis", utils._build_matcher())
+
+    assert all(contains_crisis(m) for m in CRISIS_MESSAGES)
+    assert not any(contains_crisis(m) for m in NORMAL_MESSAGES)
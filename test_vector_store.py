@@ -0,0 +1,330 @@
+"""Tests for the SQLite + memory-mapped vector store."""
+import asyncio
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import vector_store
+from vector_store import EmbeddingBatcher, OnnxEncoder, SimpleVectorStore
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, sentences, convert_to_numpy=True, batch_size=32, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        self.calls.append(texts)
+        out = np.stack([self.vector(t) for t in texts])
+        return out[0] if single else out
+
+    @staticmethod
+    def vector(text):
+        digest = hashlib.sha256(text.encode()).digest()[:8]
+        return np.frombuffer(digest, dtype=np.uint8).astype(np.float32) - 128
+
+
+def make_store(db_path, **kwargs):
+    store = SimpleVectorStore(db_path=str(db_path), **kwargs)
+    store._model = FakeModel()
+    return store
+
+
+def write_legacy_db(db_path, blobs):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE vectors (id TEXT PRIMARY KEY, text TEXT NOT NULL, vector BLOB NOT NULL)"
+    )
+    conn.executemany("INSERT INTO vectors VALUES (?, ?, ?)", blobs)
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_pickled_vectors_and_reloads(tmp_path):
+    db_path = tmp_path / "vectors.db"
+    texts = {"a": "anxiety therapy", "b": "sleep hygiene", "c": "breathing exercises"}
+    write_legacy_db(
+        db_path,
+        [(doc_id, text, pickle.dumps(FakeModel.vector(text))) for doc_id, text in texts.items()],
+    )
+
+    store = make_store(db_path)
+    results = store.similarity_search("sleep hygiene", k=1)
+    assert results[0][0] == "sleep hygiene"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+    store.close()
+
+    columns = [row[1] for row in sqlite3.connect(str(db_path)).execute("PRAGMA table_info(vectors)")]
+    assert "vector" not in columns
+
+    reloaded = make_store(db_path)
+    assert sorted(text for text, _ in reloaded.similarity_search("anxiety therapy", k=10)) == sorted(texts.values())
+    reloaded.close()
+
+
+def test_failed_migration_keeps_legacy_rows(tmp_path):
+    db_path = tmp_path / "vectors.db"
+    write_legacy_db(
+        db_path,
+        [
+            ("a", "anxiety therapy", pickle.dumps(FakeModel.vector("anxiety therapy"))),
+            ("b", "broken", b"not a pickle"),
+        ],
+    )
+
+    with pytest.raises(pickle.UnpicklingError):
+        make_store(db_path)
+
+    rows = sqlite3.connect(str(db_path)).execute("SELECT id, text FROM vectors ORDER BY id").fetchall()
+    assert rows == [("a", "anxiety therapy"), ("b", "broken")]
+    assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
+
+
+def test_add_texts_replaces_existing_ids(tmp_path):
+    store = make_store(tmp_path / "vectors.db")
+    store.add_texts(["first", "second"], ids=["1", "2"])
+    store.add_texts(["replacement"], ids=["1"])
+
+    results = store.similarity_search("replacement", k=5)
+    assert [text for text, _ in results][0] == "replacement"
+    assert sorted(text for text, _ in results) == ["replacement", "second"]
+    store.close()
+
+
+class TableModel(FakeModel):
+    """Returns fixed vectors for known texts."""
+
+    def __init__(self, table):
+        super().__init__()
+        self.table = table
+
+    def vector(self, text):
+        return np.asarray(self.table[text], dtype=np.float32)
+
+
+def test_quantized_index_covers_appended_rows(tmp_path):
+    pytest.importorskip("faiss")
+    store = SimpleVectorStore(db_path=str(tmp_path / "vectors.db"), quantize=True)
+    store._model = TableModel({
+        "a": [1.0, 0.1, 0.0, 0.0],
+        "b": [0.9, 0.2, 0.0, 0.0],
+        "new": [0.0, 0.0, 0.0, 1.0],
+    })
+    store.add_texts(["a", "b"], ids=["a", "b"])
+    store.add_texts(["new"], ids=["new"])
+
+    text, score = store.similarity_search("new", k=1)[0]
+    assert text == "new"
+    assert score == pytest.approx(1.0, abs=0.02)
+    store.close()
+
+
+def test_quantize_without_faiss_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, "faiss", None)
+    with pytest.raises(ValueError):
+        SimpleVectorStore(db_path=str(tmp_path / "vectors.db"), quantize=True)
+
+
+def test_batcher_coalesces_concurrent_embeds():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_wait_ms=50)
+    texts = [f"query {i}" for i in range(5)]
+
+    async def run():
+        try:
+            return await asyncio.gather(*(batcher.embed(t) for t in texts))
+        finally:
+            await batcher.close()
+
+    embeddings = asyncio.run(run())
+    assert model.calls == [texts]
+    for text, embedding in zip(texts, embeddings):
+        np.testing.assert_array_equal(embedding, FakeModel.vector(text))
+
+
+def test_batcher_propagates_encode_errors_to_every_waiter():
+    class FailingModel:
+        def encode(self, sentences, **kwargs):
+            raise RuntimeError("model unavailable")
+
+    batcher = EmbeddingBatcher(FailingModel(), max_wait_ms=50)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(batcher.embed(f"query {i}") for i in range(3)), return_exceptions=True
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(run())
+    assert len(results) == 3
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_stores_sharing_a_database_do_not_reuse_rows(tmp_path):
+    db_path = tmp_path / "vectors.db"
+    first = make_store(db_path)
+    second = make_store(db_path)
+    first.similarity_search("warm up", k=1)
+    second.similarity_search("warm up", k=1)
+
+    first.add_texts(["x0"], ids=["x0"])
+    second.add_texts(["y0"], ids=["y0"])
+    first.add_texts(["alpha"], ids=["alpha"])
+    second.add_texts(["beta"], ids=["beta"])
+
+    rows = sqlite3.connect(str(db_path)).execute("SELECT row_idx FROM vectors").fetchall()
+    assert sorted(row for row, in rows) == [0, 1, 2, 3]
+
+    third = make_store(db_path)
+    for text in ["x0", "y0", "alpha", "beta"]:
+        top, score = third.similarity_search(text, k=1)[0]
+        assert top == text
+        assert score == pytest.approx(1.0, abs=1e-5)
+    # A store picks up rows added elsewhere when it next writes
+    assert first.similarity_search("y0", k=1)[0][0] == "y0"
+    for store in (first, second, third):
+        store.close()
+
+
+def test_add_texts_mixed_new_replaced_and_repeated_ids(tmp_path):
+    db_path = tmp_path / "vectors.db"
+    store = make_store(db_path)
+    store.add_texts(["one", "two"], ids=["1", "2"])
+    store.add_texts(["two v2", "three", "four", "three v2"], ids=["2", "3", "4", "3"])
+    store.close()
+
+    reloaded = make_store(db_path)
+    for text in ["one", "two v2", "three v2", "four"]:
+        top, score = reloaded.similarity_search(text, k=1)[0]
+        assert top == text
+        assert score == pytest.approx(1.0, abs=1e-5)
+    assert os.path.getsize(str(tmp_path / "vectors.f32")) == 4 * 8 * 4
+    reloaded.close()
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer padding each batch to its longest text."""
+
+    def __call__(self, texts, padding=True, truncation=True, return_tensors="np"):
+        tokens = [[sum(map(ord, word)) % 50 + 1 for word in text.split()] for text in texts]
+        width = max(len(t) for t in tokens)
+        input_ids = np.zeros((len(texts), width), dtype=np.int64)
+        attention_mask = np.zeros((len(texts), width), dtype=np.int64)
+        for i, t in enumerate(tokens):
+            input_ids[i, :len(t)] = t
+            attention_mask[i, :len(t)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class FakeSession:
+    """Looks tokens up in a fixed table; padding positions get large junk values."""
+
+    table = np.random.default_rng(0).normal(size=(51, 4)).astype(np.float32)
+
+    def __init__(self):
+        self.batch_shapes = []
+
+    def __call__(self, input_ids, attention_mask):
+        self.batch_shapes.append(input_ids.shape)
+        hidden = self.table[input_ids].copy()
+        hidden[attention_mask == 0] = 1000.0
+
+        class Output:
+            last_hidden_state = hidden
+
+        return Output()
+
+
+def expected_embedding(text):
+    ids = [sum(map(ord, word)) % 50 + 1 for word in text.split()]
+    pooled = FakeSession.table[ids].mean(axis=0)
+    return pooled / np.linalg.norm(pooled)
+
+
+def test_onnx_encoder_mean_pools_and_normalizes():
+    encoder = OnnxEncoder(FakeTokenizer(), FakeSession())
+    texts = ["i feel anxious today", "help"]
+
+    embeddings = encoder.encode(texts)
+
+    assert embeddings.shape == (2, 4)
+    for text, embedding in zip(texts, embeddings):
+        np.testing.assert_allclose(embedding, expected_embedding(text), rtol=1e-5)
+        assert np.linalg.norm(embedding) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_onnx_encoder_single_and_empty_input():
+    encoder = OnnxEncoder(FakeTokenizer(), FakeSession())
+
+    single = encoder.encode("trouble sleeping")
+    assert single.shape == (4,)
+    np.testing.assert_allclose(single, expected_embedding("trouble sleeping"), rtol=1e-5)
+
+    assert encoder.encode([]).shape[0] == 0
+
+
+def test_onnx_encoder_length_sorting_keeps_input_order():
+    session = FakeSession()
+    encoder = OnnxEncoder(FakeTokenizer(), session)
+    texts = [
+        "a much longer message about feeling overwhelmed at work",
+        "hi",
+        "panic attacks at night",
+        "ok",
+        "i cannot focus on anything lately",
+    ]
+
+    batched = encoder.encode(texts, batch_size=2)
+
+    assert len(session.batch_shapes) == 3
+    for text, embedding in zip(texts, batched):
+        np.testing.assert_allclose(embedding, encoder.encode(text), rtol=1e-5)
+
+
+def test_flat_faiss_index_appends_rebuilds_and_reopens(tmp_path, monkeypatch):
+    faiss = pytest.importorskip("faiss")
+    monkeypatch.setattr(vector_store, "FAISS_MIN_VECTORS", 2)
+    db_path = tmp_path / "vectors.db"
+    store = make_store(db_path)
+
+    # Below the threshold the NumPy matrix is searched
+    store.add_texts(["one"], ids=["1"])
+    assert store._index is None
+
+    store.add_texts(["two"], ids=["2"])
+    index = store._index
+    assert isinstance(index, faiss.IndexFlatIP)
+    assert index.ntotal == 2
+
+    # Appending extends the same index
+    store.add_texts(["three", "four"], ids=["3", "4"])
+    assert store._index is index
+    assert index.ntotal == 4
+
+    # Replacing a row in place forces a rebuild
+    store.add_texts(["two v2"], ids=["2"])
+    assert store._index is not index
+    assert store._index.ntotal == 4
+    top, score = store.similarity_search("two v2", k=1)[0]
+    assert top == "two v2"
+    assert score == pytest.approx(1.0, abs=1e-5)
+    assert "two" not in [text for text, _ in store.similarity_search("two", k=4)]
+    store.close()
+
+    reopened = make_store(db_path)
+    assert [text for text, _ in reopened.similarity_search("four", k=1)] == ["four"]
+    assert isinstance(reopened._index, faiss.IndexFlatIP)
+    assert reopened._index.ntotal == 4
+    reopened.close()
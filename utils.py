@@ -0,0 +1,63 @@
+"""
+Shared helpers for message handling.
+"""
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Lowercase phrases that route a message to the crisis response
+CRISIS_PHRASES = [
+    "kill myself",
+    "killing myself",
+    "suicide",
+    "suicidal",
+    "end my life",
+    "ending my life",
+    "take my own life",
+    "want to die",
+    "wanna die",
+    "better off dead",
+    "no reason to live",
+    "don't want to live",
+    "dont want to live",
+    "hurt myself",
+    "hurting myself",
+    "harm myself",
+    "self harm",
+    "self-harm",
+    "cut myself",
+    "cutting myself",
+    "overdose",
+]
+
+
+def _build_matcher():
+    """Compile all crisis phrases once into a single-pass matcher."""
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for phrase in CRISIS_PHRASES:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text), None) is not None
+    # Fallback without pyahocorasick: one alternation regex instead of a loop of `in` checks
+    pattern = re.compile("|".join(re.escape(p) for p in CRISIS_PHRASES))
+    return lambda text: pattern.search(text) is not None
+
+
+_matches_crisis = _build_matcher()
+
+# Phone keyboards default to typographic apostrophes
+_APOSTROPHES = str.maketrans({"\u2019": "'", "\u2018": "'"})
+
+
+def _normalize(message: str) -> str:
+    """Lowercase, straighten apostrophes and collapse whitespace runs."""
+    return " ".join(message.lower().translate(_APOSTROPHES).split())
+
+
+def contains_crisis(message: str) -> bool:
+    """Return True if the message contains any crisis phrase."""
+    return _matches_crisis(_normalize(message))
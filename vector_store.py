@@ -1,20 +1,215 @@
 """
-Lightweight in-memory vector store for Python 3.14 compatibility.
+Lightweight vector store for Python 3.14 compatibility.
 Replaces Chroma to avoid pydantic.v1 incompatibility issues.
 """
+import asyncio
+import hashlib
 import json
 import pickle
 import sqlite3
 import os
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Corpus size at which search switches from NumPy to a FAISS index
+FAISS_MIN_VECTORS = 10_000
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+# Embedding backend used by the app's global store and the gunicorn preload
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return a contiguous float32 copy of `vectors` with L2-normalized rows."""
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix is vectors:
+        matrix = matrix.copy()
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+    return matrix
+
+
+def _top_k(sims: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest similarities, best first, in O(N + k log k)."""
+    k = min(k, sims.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < sims.shape[0]:
+        part = np.argpartition(-sims, k - 1)[:k]
+    else:
+        part = np.arange(sims.shape[0])
+    return part[np.argsort(-sims[part])]
+
+
+class OnnxEncoder:
+    """ONNX Runtime replacement for SentenceTransformer.encode (mean pooling + L2 norm).
+    
+    Needs the optional `optimum[onnxruntime]` package. With quantize=True the
+    exported graph is dynamically quantized to int8 for AVX512-VNNI CPUs.
+    """
+    
+    def __init__(self, tokenizer, session):
+        self.tokenizer = tokenizer
+        self.session = session
+    
+    @classmethod
+    def from_pretrained(
+        cls, model_name: str, quantize: bool = False, cache_dir: Optional[str] = None
+    ) -> "OnnxEncoder":
+        """Export (once) and load a Hugging Face model as an ONNX Runtime session."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+        
+        if "/" not in model_name:
+            model_name = f"sentence-transformers/{model_name}"
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(__file__), "onnx_models")
+        export_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+        
+        # Only the first start talks to the hub; later ones load the export
+        if os.path.exists(os.path.join(export_dir, "model.onnx")):
+            tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        else:
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+            model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            model.save_pretrained(export_dir)
+            tokenizer.save_pretrained(export_dir)
+        
+        if not quantize:
+            return cls(tokenizer, ORTModelForFeatureExtraction.from_pretrained(export_dir))
+        
+        quantized_dir = export_dir + "__int8"
+        if not os.path.exists(os.path.join(quantized_dir, "model_quantized.onnx")):
+            from optimum.onnxruntime import ORTQuantizer
+            from optimum.onnxruntime.configuration import AutoQuantizationConfig
+            
+            quantizer = ORTQuantizer.from_pretrained(export_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+        session = ORTModelForFeatureExtraction.from_pretrained(
+            quantized_dir, file_name="model_quantized.onnx"
+        )
+        return cls(tokenizer, session)
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        convert_to_numpy: bool = True,
+        **kwargs,
+    ) -> np.ndarray:
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        
+        # Batch similar lengths together so little compute goes to padding
+        order = np.argsort([len(t) for t in sentences], kind="stable")
+        sorted_sentences = [sentences[i] for i in order]
+        
+        batches = []
+        for start in range(0, len(sorted_sentences), batch_size):
+            inputs = self.tokenizer(
+                sorted_sentences[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np",
+            )
+            hidden = self.session(**inputs).last_hidden_state
+            # Mean pooling over non-padding tokens
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(_normalize_rows(pooled))
+        
+        if not batches:
+            return np.empty((0, 0), dtype=np.float32)
+        # Scatter rows back to the caller's order
+        sorted_embeddings = np.concatenate(batches)
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings[0] if single else embeddings
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent single-text encode requests into batched model calls."""
+    
+    def __init__(self, model: Union[SentenceTransformer, OnnxEncoder], max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed a single text, sharing a model call with other pending requests."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # (Re)start the worker on the current event loop
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await loop.run_in_executor(
+                    None,
+                    lambda: self.model.encode(texts, convert_to_numpy=True, batch_size=len(texts)),
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+    
+    async def close(self):
+        """Stop the background worker."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
 class SimpleVectorStore:
-    """In-memory vector store with SQLite persistence."""
+    """Vector store with memory-mapped embeddings and SQLite metadata."""
     
-    def __init__(self, db_path: Optional[str] = None, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        model_name: str = "all-MiniLM-L6-v2",
+        quantize: bool = False,
+        backend: str = "torch",
+    ):
         # Default to putting db_path in same directory as src
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), "vector_store.db")
@@ -29,12 +224,43 @@ class SimpleVectorStore:
             os.makedirs(db_dir, exist_ok=True)
         
         self.db_path = db_path
-        self.model = SentenceTransformer(model_name)
-        self.vectors: Dict[str, np.ndarray] = {}
+        # Normalized float32 rows live in a flat file next to the database
+        self.embeddings_path = os.path.splitext(db_path)[0] + ".f32"
+        # Model weights load on first use; see the model property
+        self.model_name = model_name
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        self.backend = backend
+        self._model: Optional[Union[SentenceTransformer, OnnxEncoder]] = None
+        # Memory-mapped (N, D) normalized float32 matrix; row i belongs to self._ids[i]
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
         self.texts: Dict[str, str] = {}
+        # quantize=True searches an 8-bit FAISS scalar-quantizer index at any corpus size
+        if quantize and faiss is None:
+            raise ValueError("quantize=True requires faiss (pip install faiss-cpu)")
+        self.quantize = quantize
+        # FAISS index over _matrix once the corpus is large enough
+        self._index = None
+        self._batcher: Optional["EmbeddingBatcher"] = None
+        # LRU of query digest -> float32 embedding, skips the model on repeats
+        self._query_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._query_cache_cap = 4096
+        # LRU of (query digest, k, corpus version) -> ranked results
+        self._result_cache: "OrderedDict[Tuple[bytes, int, int], List[Tuple[str, float]]]" = OrderedDict()
+        self._result_cache_cap = 4096
+        self.corpus_version = 0
         self.conn = None
         self._init_db()
     
+    @property
+    def model(self) -> Union[SentenceTransformer, OnnxEncoder]:
+        """Embedding model, loaded on first access."""
+        if self._model is None:
+            self._model = load_model(self.model_name, self.backend)
+        return self._model
+    
     def _init_db(self):
         """Initialize SQLite database for persistence."""
         self.conn = sqlite3.connect(self.db_path)
@@ -43,60 +269,291 @@ class SimpleVectorStore:
             CREATE TABLE IF NOT EXISTS vectors (
                 id TEXT PRIMARY KEY,
                 text TEXT NOT NULL,
-                vector BLOB NOT NULL
+                row_idx INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
             )
         """)
         self.conn.commit()
+        self._migrate_pickled_vectors()
+    
+    def _migrate_pickled_vectors(self):
+        """Move vectors from the old pickled BLOB column into the embeddings file."""
+        if not self._has_legacy_column():
+            return
+        
+        # Several workers may open the same legacy database at once; the write lock
+        # makes one of them migrate and the rest see the new schema on re-check
+        cursor = self.conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        tmp_path = None
+        try:
+            if not self._has_legacy_column():
+                self.conn.commit()
+                return
+            
+            rows = cursor.execute("SELECT id, text, vector FROM vectors ORDER BY id").fetchall()
+            
+            # Decode everything and write the new file aside before touching the table,
+            # so a bad blob leaves the legacy data intact
+            matrix = None
+            if rows:
+                matrix = _normalize_rows(np.stack([pickle.loads(blob) for _, _, blob in rows]))
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(self.embeddings_path) or None, suffix=".f32.tmp"
+                )
+                with os.fdopen(fd, "wb") as f:
+                    matrix.tofile(f)
+            
+            cursor.execute("DROP TABLE vectors")
+            cursor.execute("""
+                CREATE TABLE vectors (
+                    id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    row_idx INTEGER NOT NULL
+                )
+            """)
+            if matrix is not None:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(matrix.shape[1]),)
+                )
+                cursor.executemany(
+                    "INSERT INTO vectors (id, text, row_idx) VALUES (?, ?, ?)",
+                    ((doc_id, text, row_idx) for row_idx, (doc_id, text, _) in enumerate(rows))
+                )
+                os.replace(tmp_path, self.embeddings_path)
+                tmp_path = None
+            elif os.path.exists(self.embeddings_path):
+                os.remove(self.embeddings_path)
+            self.conn.commit()
+        except Exception:
+            # The legacy table is still in place, so the migration simply reruns next time
+            self.conn.rollback()
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _has_legacy_column(self) -> bool:
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(vectors)")]
+        return "vector" in columns
     
     def add_texts(self, texts: List[str], ids: Optional[List[str]] = None) -> List[str]:
         """Add texts to the vector store."""
         if ids is None:
             ids = [f"doc_{i}" for i in range(len(texts))]
+        if not texts:
+            return ids
         
         # Embed texts
         embeddings = self.model.encode(texts, convert_to_numpy=True)
+        normed = _normalize_rows(embeddings)
+        dim = normed.shape[1]
         
+        # Other stores (e.g. other workers) may share this database, so rows are
+        # allocated from the database itself while holding its write lock
         cursor = self.conn.cursor()
-        for doc_id, text, embedding in zip(ids, texts, embeddings):
-            vector_bytes = pickle.dumps(embedding)
-            cursor.execute(
-                "INSERT OR REPLACE INTO vectors (id, text, vector) VALUES (?, ?, ?)",
-                (doc_id, text, vector_bytes)
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            existing = dict(cursor.execute("SELECT id, row_idx FROM vectors").fetchall())
+            next_row = cursor.execute("SELECT COALESCE(MAX(row_idx) + 1, 0) FROM vectors").fetchone()[0]
+            
+            # The last occurrence of a repeated id wins
+            latest = {doc_id: i for i, doc_id in enumerate(ids)}
+            first_new = next_row
+            records = []
+            replaced = []
+            appended = []
+            for doc_id, i in latest.items():
+                row = existing.get(doc_id)
+                if row is None:
+                    row = next_row
+                    next_row += 1
+                    appended.append(i)
+                else:
+                    replaced.append((row, i))
+                records.append((doc_id, texts[i], row, i))
+            
+            # Rows are fixed-size float32 records: new ids are one contiguous block at
+            # the end, replaced ids are overwritten in place
+            fd = os.open(self.embeddings_path, os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, "r+b") as f:
+                if appended:
+                    block = normed if len(appended) == len(normed) else normed[appended]
+                    f.seek(first_new * dim * 4)
+                    block.tofile(f)
+                for row, i in replaced:
+                    f.seek(row * dim * 4)
+                    # Contiguous float32 row goes straight through the buffer protocol
+                    f.write(normed[i])
+            
+            # One prepared statement for the whole batch
+            cursor.executemany(
+                "INSERT OR REPLACE INTO vectors (id, text, row_idx) VALUES (?, ?, ?)",
+                [(doc_id, text, row) for doc_id, text, row, _ in records],
             )
-            self.vectors[doc_id] = embedding
-            self.texts[doc_id] = text
+            cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
         
-        self.conn.commit()
+        # Reload ids so rows added by other stores are picked up too; the index can
+        # be extended from the first row this store has not indexed yet
+        indexed = len(self._ids) if self._matrix is not None else 0
+        self._load_all_vectors(start=min([indexed] + [row for _, _, row, _ in records]))
+        self.corpus_version += 1
+        self._result_cache.clear()
         return ids
     
     def similarity_search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
         """Search for similar texts."""
-        query_embedding = self.model.encode(query, convert_to_numpy=True)
-        
+        key = (self._query_key(query), k, self.corpus_version)
+        results = self._cached_results(key)
+        if results is None:
+            query_embedding = self._embed_query(query)
+            results = self._cache_results(key, self._search_embedding(query_embedding, k))
+        return list(results)
+    
+    async def similarity_search_async(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """Search for similar texts, batching the query embedding with concurrent callers."""
+        digest = self._query_key(query)
+        key = (digest, k, self.corpus_version)
+        results = self._cached_results(key)
+        if results is None:
+            query_embedding = self._cached_query(digest)
+            if query_embedding is None:
+                if self._batcher is None:
+                    self._batcher = EmbeddingBatcher(self.model)
+                query_embedding = self._cache_query(digest, await self._batcher.embed(query))
+            results = self._cache_results(key, self._search_embedding(query_embedding, k))
+        return list(results)
+    
+    @staticmethod
+    def _query_key(query: str) -> bytes:
+        return hashlib.blake2b(query.encode(), digest_size=16).digest()
+    
+    def _cached_query(self, key: bytes) -> Optional[np.ndarray]:
+        embedding = self._query_cache.get(key)
+        if embedding is not None:
+            self._query_cache.move_to_end(key)
+        return embedding
+    
+    def _cache_query(self, key: bytes, embedding: np.ndarray) -> np.ndarray:
+        # Normalized once here, so cache hits go straight to the dot product
+        embedding = embedding.astype(np.float32)
+        embedding /= np.linalg.norm(embedding) + 1e-8
+        embedding.flags.writeable = False
+        self._query_cache[key] = embedding
+        if len(self._query_cache) > self._query_cache_cap:
+            self._query_cache.popitem(last=False)
+        return embedding
+    
+    def _cached_results(self, key: Tuple[bytes, int, int]) -> Optional[List[Tuple[str, float]]]:
+        results = self._result_cache.get(key)
+        if results is not None:
+            self._result_cache.move_to_end(key)
+        return results
+    
+    def _cache_results(
+        self, key: Tuple[bytes, int, int], results: List[Tuple[str, float]]
+    ) -> List[Tuple[str, float]]:
+        # Results computed against an older corpus are not worth keeping
+        if key[2] == self.corpus_version:
+            self._result_cache[key] = results
+            if len(self._result_cache) > self._result_cache_cap:
+                self._result_cache.popitem(last=False)
+        return results
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing the cached embedding for repeated text."""
+        key = self._query_key(query)
+        embedding = self._cached_query(key)
+        if embedding is None:
+            embedding = self._cache_query(key, self.model.encode(query, convert_to_numpy=True))
+        return embedding
+    
+    def _search_embedding(self, query_embedding: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Rank stored texts against a normalized float32 query embedding."""
         # Load all vectors from DB if not in memory
-        if not self.vectors:
+        if self._matrix is None:
             self._load_all_vectors()
+        if not self._ids or k <= 0:
+            return []
         
-        # Compute similarities
-        similarities = []
-        for doc_id, vector in self.vectors.items():
-            # Cosine similarity
-            sim = np.dot(query_embedding, vector) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(vector) + 1e-8
-            )
-            similarities.append((self.texts[doc_id], float(sim)))
+        if self._index is not None:
+            scores, found = self._index.search(query_embedding[None, :], min(k, len(self._ids)))
+            return [
+                (self.texts[self._ids[i]], score)
+                for i, score in zip(found[0].tolist(), scores[0].tolist())
+                if i >= 0 and self._ids[i] is not None
+            ]
+        
+        # Rows are pre-normalized, so cosine similarity is one matrix-vector product
+        sims = self._matrix @ query_embedding
         
-        # Sort by similarity and return top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+        # Only the k selected scores become Python floats, converted in one call
+        idx = _top_k(sims, k)
+        return [
+            (self.texts[self._ids[i]], score)
+            for i, score in zip(idx.tolist(), sims[idx].tolist())
+            if self._ids[i] is not None
+        ]
     
-    def _load_all_vectors(self):
-        """Load all vectors from database into memory."""
+    def _load_all_vectors(self, start: int = 0):
+        """Map the embeddings file and load ids and texts from the database.
+        
+        Rows before `start` are unchanged since the last load, which lets the
+        search index be extended instead of rebuilt.
+        """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT id, text, vector FROM vectors")
-        for doc_id, text, vector_bytes in cursor.fetchall():
-            self.vectors[doc_id] = pickle.loads(vector_bytes)
+        rows = cursor.execute("SELECT id, text, row_idx FROM vectors").fetchall()
+        n_rows = max((row_idx for _, _, row_idx in rows), default=-1) + 1
+        # Indexed by row_idx; a row no id points at stays None and is never returned
+        self._ids = [None] * n_rows
+        self._rows = {}
+        self.texts = {}
+        for doc_id, text, row_idx in rows:
+            self._rows[doc_id] = row_idx
+            self._ids[row_idx] = doc_id
             self.texts[doc_id] = text
+        
+        dim = cursor.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        dim = int(dim[0]) if dim else 0
+        if n_rows and dim:
+            self._matrix = np.memmap(
+                self.embeddings_path, dtype=np.float32, mode="r", shape=(n_rows, dim)
+            )
+        else:
+            self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._refresh_index(start)
+    
+    def _refresh_index(self, start: int = 0):
+        """Bring the FAISS index, if one is used, up to date with rows from `start` on."""
+        n = len(self._ids)
+        if faiss is not None and n and (n >= FAISS_MIN_VECTORS or self.quantize):
+            # Flat indexes can only append, so changed rows mean a rebuild. The
+            # scalar quantizer's ranges come from training data, so it is retrained
+            # on every change rather than clipping new rows to stale ranges.
+            if self.quantize or self._index is None or self._index.ntotal != start:
+                self._index = self._new_faiss_index(self._matrix.shape[1])
+                start = 0
+            self._index.add(np.ascontiguousarray(self._matrix[start:]))
+        else:
+            self._index = None
+    
+    def _new_faiss_index(self, dim: int):
+        """Inner-product index; rows are normalized so scores are cosine similarities."""
+        if self.quantize:
+            index = faiss.IndexScalarQuantizer(
+                dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+            )
+            index.train(np.ascontiguousarray(self._matrix))
+            return index
+        return faiss.IndexFlatIP(dim)
     
     def close(self):
         """Close database connection."""
@@ -104,6 +561,24 @@ class SimpleVectorStore:
             self.conn.close()
 
 
+# Loaded models by (model_name, backend), kept apart from any store so they can be
+# preloaded before fork without sharing a SQLite connection with the workers
+_models: Dict[Tuple[str, str], Union[SentenceTransformer, OnnxEncoder]] = {}
+
+def load_model(
+    model_name: str = "all-MiniLM-L6-v2", backend: str = EMBEDDING_BACKEND
+) -> Union[SentenceTransformer, OnnxEncoder]:
+    """Get or load the shared embedding model."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    key = (model_name, backend)
+    if key not in _models:
+        if backend == "torch":
+            _models[key] = SentenceTransformer(model_name)
+        else:
+            _models[key] = OnnxEncoder.from_pretrained(model_name, quantize=backend == "onnx-int8")
+    return _models[key]
+
 # Global instance
 _store: Optional[SimpleVectorStore] = None
 
@@ -111,7 +586,7 @@ def get_vector_store() -> SimpleVectorStore:
     """Get or create global vector store instance."""
     global _store
     if _store is None:
-        _store = SimpleVectorStore()
+        _store = SimpleVectorStore(backend=EMBEDDING_BACKEND)
     return _store
 
 def close_vector_store():